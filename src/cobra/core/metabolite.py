@@ -1,7 +1,7 @@
 """Define the Metabolite class."""
 
 import re
-from typing import TYPE_CHECKING, Dict, Optional, Union
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Union
 from warnings import warn
 
 from ..exceptions import OptimizationError
@@ -278,17 +278,19 @@ class Metabolite(Species):
 
     def summary(
         self,
-        solution: Optional["Solution"] = None,
+        solution: Optional[Union["Solution", Literal[False]]] = None,
         fva: Optional[Union[float, "DataFrame"]] = None,
     ) -> "MetaboliteSummary":
         """Create a summary of the producing and consuming fluxes.
 
         Parameters
         ----------
-        solution : cobra.Solution, optional
+        solution : cobra.Solution or False, optional
             A previous model solution to use for generating the summary. If
             ``None``, the summary method will generate a parsimonious flux
-            distribution (default None).
+            distribution. If ``False``, no flux distribution is computed and
+            only the flux variability ranges given by `fva` are reported
+            (default None).
         fva : pandas.DataFrame or float, optional
             Whether or not to include flux variability analysis in the output.
             If given, `fva` should either be a previous FVA solution matching the
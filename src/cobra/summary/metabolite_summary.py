@@ -2,10 +2,21 @@
 
 
 import logging
+from functools import cached_property, lru_cache
 from operator import attrgetter
 from textwrap import shorten
-from typing import TYPE_CHECKING, List, Optional, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
 
 from cobra.flux_analysis import flux_variability_analysis, pfba
@@ -19,6 +30,112 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# Importing numba and compiling the kernel costs far more than the vectorized
+# version takes on the few dozen reactions of a typical metabolite, so the compiled
+# kernel is only used for very large reaction sets.
+_JIT_MIN_SIZE = 100_000
+
+
+def _scale_fva_vectorized(
+    flux: np.ndarray,
+    minimum: np.ndarray,
+    maximum: np.ndarray,
+    factor: np.ndarray,
+    tolerance: float,
+) -> None:
+    """
+    Prepare the flux variability of a metabolite's reactions for display in place.
+
+    Fluxes and bounds below the tolerance are set to zero, leaving undetermined
+    fluxes untouched. The bounds are scaled by the stoichiometric coefficients and
+    swapped where the coefficient is negative, such that the minimum stays below
+    the maximum.
+
+    Parameters
+    ----------
+    flux : numpy.ndarray
+        The fluxes, already scaled by the stoichiometric coefficients.
+    minimum : numpy.ndarray
+        The minimum fluxes of the reactions.
+    maximum : numpy.ndarray
+        The maximum fluxes of the reactions.
+    factor : numpy.ndarray
+        The stoichiometric coefficients of the metabolite in the reactions.
+    tolerance : float
+        The model tolerance.
+
+    """
+    flux[np.abs(flux) < tolerance] = 0.0
+    below_minimum = ~(np.abs(minimum) >= tolerance)
+    below_maximum = ~(np.abs(maximum) >= tolerance)
+    minimum *= factor
+    maximum *= factor
+    # Setting values to zero after scaling avoids negative zeros in the display.
+    minimum[below_minimum] = 0.0
+    maximum[below_maximum] = 0.0
+    negative = factor < 0
+    lower = np.where(negative, maximum, minimum)
+    maximum[:] = np.where(negative, minimum, maximum)
+    minimum[:] = lower
+
+
+def _scale_fva_loop(
+    flux: np.ndarray,
+    minimum: np.ndarray,
+    maximum: np.ndarray,
+    factor: np.ndarray,
+    tolerance: float,
+) -> None:
+    """
+    Prepare the flux variability for display in a single pass.
+
+    This is the element-wise equivalent of `_scale_fva_vectorized` meant to be
+    compiled by numba.
+
+    """
+    for i in range(flux.shape[0]):
+        if abs(flux[i]) < tolerance:
+            flux[i] = 0.0
+        lower = minimum[i] * factor[i] if abs(minimum[i]) >= tolerance else 0.0
+        upper = maximum[i] * factor[i] if abs(maximum[i]) >= tolerance else 0.0
+        if factor[i] < 0:
+            lower, upper = upper, lower
+        minimum[i] = lower
+        maximum[i] = upper
+
+
+@lru_cache(maxsize=None)
+def _compile_scale_fva() -> Optional[Callable[..., None]]:
+    """Return the numba-compiled `_scale_fva_loop` or ``None`` without numba."""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_scale_fva_loop)
+
+
+def _scale_fva(
+    flux: np.ndarray,
+    minimum: np.ndarray,
+    maximum: np.ndarray,
+    factor: np.ndarray,
+    tolerance: float,
+) -> None:
+    """
+    Prepare the flux variability for display in place.
+
+    Large inputs are handled by the numba-compiled kernel if numba is installed,
+    all others by `_scale_fva_vectorized`, which documents the parameters.
+
+    """
+    if flux.shape[0] >= _JIT_MIN_SIZE:
+        kernel = _compile_scale_fva()
+        if kernel is not None:
+            kernel(flux, minimum, maximum, factor, tolerance)
+            return
+    _scale_fva_vectorized(flux, minimum, maximum, factor, tolerance)
+
+
 class MetaboliteSummary(Summary):
     """
     Define the metabolite summary.
@@ -43,7 +160,7 @@ class MetaboliteSummary(Summary):
         *,
         metabolite: "Metabolite",
         model: "Model",
-        solution: Optional["Solution"] = None,
+        solution: Optional[Union["Solution", Literal[False]]] = None,
         fva: Optional[Union[float, pd.DataFrame]] = None,
         **kwargs,
     ) -> None:
@@ -56,10 +173,13 @@ class MetaboliteSummary(Summary):
             The metabolite object whose summary we intend to get.
         model : cobra.Model
             The metabolic model for which to generate a metabolite summary.
-        solution : cobra.Solution, optional
+        solution : cobra.Solution or False, optional
             A previous model solution to use for generating the summary. If
             ``None``, the summary method will generate a parsimonious flux
-            distribution (default None).
+            distribution. If ``False``, no flux distribution is computed at all
+            and only the flux variability ranges are reported, which requires
+            `fva` to be given. The flux and percent columns are then left empty
+            (default None).
         fva : pandas.DataFrame or float, optional
             Whether or not to include flux variability analysis in the output.
             If given, `fva` should either be a previous FVA solution matching the
@@ -79,18 +199,39 @@ class MetaboliteSummary(Summary):
 
         """
         super().__init__(**kwargs)
-        self._metabolite = metabolite.copy()
-        self._reactions: List["Reaction"] = [
-            r.copy() for r in sorted(metabolite.reactions, key=attrgetter("id"))
-        ]
-        self.producing_flux: Optional[pd.DataFrame] = None
-        self.consuming_flux: Optional[pd.DataFrame] = None
+        self._metabolite_id: str = metabolite.id
+        self._metabolite_name: str = metabolite.name
+        self._metabolite_formula: str = metabolite.formula
+        reactions: List["Reaction"] = sorted(metabolite.reactions, key=attrgetter("id"))
+        self._reaction_ids: Tuple[str, ...] = tuple(r.id for r in reactions)
+        # Look up the coefficients by metabolite object directly rather than by
+        # identifier, which requires a scan of each reaction's metabolites.
+        self._factor: np.ndarray = np.fromiter(
+            (r._metabolites[metabolite] for r in reactions),
+            dtype=float,
+            count=len(reactions),
+        )
+        # Only the reaction definitions are needed for display. Taking a snapshot of
+        # them is much cheaper than copying every reaction and still isolates the
+        # summary from later changes to the model.
+        self._definition_plain: pd.Series = pd.Series(
+            [r.build_reaction_string(False) for r in reactions],
+            index=self._reaction_ids,
+            dtype=object,
+        )
+        self._definition_names: pd.Series = pd.Series(
+            [r.build_reaction_string(True) for r in reactions],
+            index=self._reaction_ids,
+            dtype=object,
+        )
+        self._display_cache: Dict[Tuple[str, bool, float], pd.DataFrame] = {}
+        self._header_cache: Dict[Tuple[bool, int], str] = {}
         self._generate(model, solution, fva)
 
     def _generate(
         self,
         model: "Model",
-        solution: Optional["Solution"],
+        solution: Optional[Union["Solution", Literal[False]]],
         fva: Optional[Union[float, pd.DataFrame]],
     ) -> None:
         """
@@ -100,19 +241,35 @@ class MetaboliteSummary(Summary):
         ----------
         model : cobra.Model
             The metabolic model for which to generate a metabolite summary.
-        solution : cobra.Solution, optional
+        solution : cobra.Solution or False, optional
             A previous model solution to use for generating the summary. If
             ``None``, the summary method will generate a parsimonious flux
-            distribution.
+            distribution. If ``False``, fluxes are left undetermined and only
+            the flux variability ranges are reported.
         fva : pandas.DataFrame or float, optional
             Whether or not to include flux variability analysis in the output.
             If given, `fva` should either be a previous FVA solution matching the
             model or a float between 0 and 1 representing the fraction of the
             optimum objective to be searched.
 
+        Raises
+        ------
+        ValueError
+            If `solution` is ``True``, or if it is ``False`` but no `fva` is given.
+
         """
         super()._generate(model=model, solution=solution, fva=fva)
 
+        if solution is True:
+            raise ValueError(
+                "The solution must be a cobra.Solution, None, or False to skip the "
+                "flux distribution."
+            )
+        if solution is False and fva is None:
+            raise ValueError(
+                "Skipping the flux distribution requires flux variability analysis "
+                "results to summarize."
+            )
         if solution is None:
             logger.info("Generating new parsimonious flux distribution.")
             solution = pfba(model)
@@ -121,76 +278,104 @@ class MetaboliteSummary(Summary):
             logger.info("Performing flux variability analysis.")
             fva = flux_variability_analysis(
                 model=model,
-                reaction_list=[r.id for r in self._reactions],
+                reaction_list=list(self._reaction_ids),
                 fraction_of_optimum=fva,
             )
 
-        # Create the basic flux table.
-        flux = pd.DataFrame(
-            data=[
-                (
-                    r.id,
-                    solution[r.id],
-                    r.get_coefficient(self._metabolite.id),
+        # Create the basic flux table with fluxes scaled by the stoichiometric
+        # coefficient.
+        factor = self._factor
+        if solution is False:
+            fluxes = np.full(len(self._reaction_ids), np.nan)
+        elif isinstance(getattr(solution, "fluxes", None), pd.Series):
+            positions = solution.fluxes.index.get_indexer(self._reaction_ids)
+            if (positions < 0).any():
+                missing = [
+                    rxn_id
+                    for rxn_id, position in zip(self._reaction_ids, positions)
+                    if position < 0
+                ]
+                raise KeyError(
+                    "The solution is missing the fluxes of reactions: "
+                    f"{', '.join(missing)}."
                 )
-                for r in self._reactions
-            ],
-            columns=["reaction", "flux", "factor"],
-            index=[r.id for r in self._reactions],
-        )
-        # Scale fluxes by stoichiometric coefficient.
-        flux["flux"] *= flux["factor"]
-
-        if fva is not None:
-            flux = flux.join(fva)
-            view = flux[["flux", "minimum", "maximum"]]
-            # Set fluxes below model tolerance to zero.
-            flux[["flux", "minimum", "maximum"]] = view.where(
-                view.abs() >= model.tolerance, 0
-            )
-            # Create the scaled compound flux.
-            flux[["minimum", "maximum"]] = flux[["minimum", "maximum"]].mul(
-                flux["factor"], axis=0
-            )
-            # Negative factors invert the minimum/maximum relationship.
-            negative = flux["factor"] < 0
-            tmp = flux.loc[negative, "maximum"]
-            flux.loc[negative, "maximum"] = flux.loc[negative, "minimum"]
-            flux.loc[negative, "minimum"] = tmp
-            # Add zero to turn negative zero into positive zero for nicer display later.
-            flux[["flux", "minimum", "maximum"]] += 0
+            fluxes = solution.fluxes.to_numpy(dtype=float)[positions]
         else:
-            # Set fluxes below model tolerance to zero.
-            flux.loc[flux["flux"].abs() < model.tolerance, "flux"] = 0
-            # Add zero to turn negative zero into positive zero for nicer display later.
-            flux["flux"] += 0
-
-        # Create production table from producing fluxes or zero fluxes where the
-        # metabolite is a product in the reaction.
-        is_produced = (flux["flux"] > 0) | ((flux["flux"] == 0) & (flux["factor"] > 0))
-        if fva is not None:
-            self.producing_flux = flux.loc[
-                is_produced, ["flux", "minimum", "maximum", "reaction"]
-            ].copy()
-        else:
-            self.producing_flux = flux.loc[is_produced, ["flux", "reaction"]].copy()
-        production = self.producing_flux["flux"].abs()
-        self.producing_flux["percent"] = production / production.sum()
+            fluxes = np.array(
+                [solution[rxn_id] for rxn_id in self._reaction_ids], dtype=float
+            )
+        flux = pd.DataFrame(
+            {
+                "reaction": self._reaction_ids,
+                "flux": fluxes * factor,
+                "factor": factor,
+            },
+            index=self._reaction_ids,
+        )
 
-        # Create consumption table from consuming fluxes or zero fluxes where the
-        # metabolite is a substrate in the reaction.
-        is_consumed = (flux["flux"] < 0) | ((flux["flux"] == 0) & (flux["factor"] < 0))
         if fva is not None:
-            self.consuming_flux = flux.loc[
-                is_consumed, ["flux", "minimum", "maximum", "reaction"]
-            ].copy()
+            # The flux table is ordered by reaction, so align the FVA bounds with it
+            # once and work on positional arrays from here on.
+            bounds = fva.reindex(self._reaction_ids)
+            values = flux["flux"].to_numpy(dtype=float, copy=True)
+            minimum = bounds["minimum"].to_numpy(dtype=float, copy=True)
+            maximum = bounds["maximum"].to_numpy(dtype=float, copy=True)
+            _scale_fva(values, minimum, maximum, factor, model.tolerance)
+            flux["flux"] = values
+            flux["minimum"] = minimum
+            flux["maximum"] = maximum
         else:
-            self.consuming_flux = flux.loc[is_consumed, ["flux", "reaction"]].copy()
-        consumption = self.consuming_flux["flux"].abs()
-        self.consuming_flux["percent"] = consumption / consumption.sum()
+            # Set fluxes below model tolerance to (positive) zero.
+            values = flux["flux"].to_numpy()
+            flux["flux"] = np.where(np.abs(values) >= model.tolerance, values, 0.0)
 
         self._flux = flux
 
+    @cached_property
+    def _direction(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return boolean masks of the producing and the consuming reactions."""
+        flux = self._flux["flux"].to_numpy()
+        factor = self._flux["factor"].to_numpy()
+        # Zero or undetermined fluxes are assigned by the metabolite's role in the
+        # reaction.
+        is_undetermined = (flux == 0) | np.isnan(flux)
+        is_produced = (flux > 0) | (is_undetermined & (factor > 0))
+        is_consumed = (flux < 0) | (is_undetermined & (factor < 0))
+        return is_produced, is_consumed
+
+    @cached_property
+    def producing_flux(self) -> pd.DataFrame:
+        """Return a pandas DataFrame of only the producing fluxes."""
+        return self._select_flux(self._direction[0])
+
+    @cached_property
+    def consuming_flux(self) -> pd.DataFrame:
+        """Return a pandas DataFrame of only the consuming fluxes."""
+        return self._select_flux(self._direction[1])
+
+    def _select_flux(self, mask: np.ndarray) -> pd.DataFrame:
+        """
+        Select the fluxes of some reactions and compute their flux percentages.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray
+            A boolean array selecting the reactions.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The fluxes (and their ranges) of the selected reactions.
+
+        """
+        if "minimum" in self._flux.columns:
+            columns = ["flux", "minimum", "maximum", "reaction"]
+        else:
+            columns = ["flux", "reaction"]
+        frame = self._flux.iloc[mask, self._flux.columns.get_indexer(columns)]
+        frame["percent"] = self._percent(frame["flux"])
+        return frame
+
     def _display_flux(
         self, frame: pd.DataFrame, names: bool, threshold: float
     ) -> pd.DataFrame:
@@ -214,27 +399,114 @@ class MetaboliteSummary(Summary):
 
         """
         if "minimum" in frame.columns and "maximum" in frame.columns:
-            frame = frame.loc[
-                (frame["flux"].abs() >= threshold)
-                | (frame["minimum"].abs() >= threshold)
-                | (frame["maximum"].abs() >= threshold),
-                :,
-            ].copy()
+            columns = ["flux", "minimum", "maximum"]
         else:
-            frame = frame.loc[frame["flux"].abs() >= threshold, :].copy()
-        reactions = {r.id: r for r in self._reactions}
-        frame["definition"] = [
-            reactions[rxn_id].build_reaction_string(names)
-            for rxn_id in frame["reaction"]
-        ]
+            columns = ["flux"]
+        keep = (np.abs(frame[columns].to_numpy()) >= threshold).any(axis=1)
+        frame = frame.iloc[keep].copy()
+        frame["definition"] = frame["reaction"].map(
+            self._definition_names if names else self._definition_plain
+        )
         if "minimum" in frame.columns and "maximum" in frame.columns:
-            frame["range"] = list(
-                frame[["minimum", "maximum"]].itertuples(index=False, name=None)
-            )
-            return frame[["percent", "flux", "range", "reaction", "definition"]]
+            return frame[
+                ["percent", "flux", "minimum", "maximum", "reaction", "definition"]
+            ]
         else:
             return frame[["percent", "flux", "reaction", "definition"]]
 
+    @staticmethod
+    def _percent(flux: pd.Series) -> np.ndarray:
+        """
+        Compute each flux's share of the total absolute flux.
+
+        Parameters
+        ----------
+        flux : pandas.Series
+            The producing or consuming fluxes.
+
+        Returns
+        -------
+        numpy.ndarray
+            The relative fluxes, which are all zero if the total flux is zero.
+
+        """
+        magnitude = np.abs(flux.to_numpy())
+        total = magnitude.sum()
+        if total:
+            magnitude /= total
+        return magnitude
+
+    def _cached_display_flux(
+        self, direction: str, names: bool, threshold: float
+    ) -> pd.DataFrame:
+        """
+        Return the display frame of either the producing or consuming fluxes.
+
+        The transformed frames are cached such that rendering the summary as both
+        string and HTML does not repeat the work.
+
+        Parameters
+        ----------
+        direction : {"producing", "consuming"}
+            Which of the flux tables to transform.
+        names : bool
+            Whether or not elements should be displayed by their common names.
+        threshold : float
+            Hide fluxes below the threshold from being displayed.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The transformed pandas DataFrame. It must not be modified in place.
+
+        """
+        key = (direction, names, threshold)
+        if key not in self._display_cache:
+            if direction == "producing":
+                frame = self.producing_flux
+            else:
+                frame = self.consuming_flux
+            self._display_cache[key] = self._display_flux(frame, names, threshold)
+        return self._display_cache[key]
+
+    @staticmethod
+    def _merge_range(
+        frame: pd.DataFrame, float_format: str, separator: str = "; "
+    ) -> pd.DataFrame:
+        """
+        Combine the minimum and maximum columns into a formatted range column.
+
+        Parameters
+        ----------
+        frame : pandas.DataFrame
+            A pandas DataFrame of fluxes.
+        float_format : str
+            Format string for floats.
+        separator : str, optional
+            The string placed between the minimum and the maximum (default '; ').
+
+        Returns
+        -------
+        pandas.DataFrame
+            The data frame with a range column of formatted strings in place of
+            the separate bounds, if present.
+
+        """
+        if "Minimum" not in frame.columns or "Maximum" not in frame.columns:
+            return frame
+        frame.insert(
+            frame.columns.get_loc("Minimum"),
+            "Range",
+            [
+                f"[{lower:{float_format}}{separator}{upper:{float_format}}]"
+                for lower, upper in zip(
+                    frame["Minimum"].to_numpy().tolist(),
+                    frame["Maximum"].to_numpy().tolist(),
+                )
+            ],
+        )
+        return frame.drop(columns=["Minimum", "Maximum"])
+
     @staticmethod
     def _string_table(frame: pd.DataFrame, float_format: str, column_width: int) -> str:
         """
@@ -255,7 +527,9 @@ class MetaboliteSummary(Summary):
             The data frame formatted as a pretty string.
 
         """
-        frame.columns = [header.title() for header in frame.columns]
+        frame = MetaboliteSummary._merge_range(
+            frame.rename(columns=str.title), float_format
+        )
         return frame.to_string(
             header=True,
             index=False,
@@ -263,8 +537,6 @@ class MetaboliteSummary(Summary):
             formatters={
                 "Percent": "{:.2%}".format,
                 "Flux": f"{{:{float_format}}}".format,
-                "Range": lambda pair: f"[{pair[0]:{float_format}}; "
-                f"{pair[1]:{float_format}}]",
             },
             max_colwidth=column_width,
         )
@@ -287,7 +559,9 @@ class MetaboliteSummary(Summary):
             The data frame formatted as HTML.
 
         """
-        frame.columns = [header.title() for header in frame.columns]
+        frame = MetaboliteSummary._merge_range(
+            frame.rename(columns=str.title), float_format, separator=";  "
+        )
         return frame.to_html(
             header=True,
             index=False,
@@ -295,8 +569,6 @@ class MetaboliteSummary(Summary):
             formatters={
                 "Percent": "{:.2%}".format,
                 "Flux": f"{{:{float_format}}}".format,
-                "Range": lambda pair: f"[{pair[0]:{float_format}}; "
-                f" {pair[1]:{float_format}}]",
             },
         )
 
@@ -331,23 +603,23 @@ class MetaboliteSummary(Summary):
         """
         threshold = self._normalize_threshold(threshold)
 
-        if names:
-            metabolite = shorten(
-                self._metabolite.name, width=column_width, placeholder="..."
-            )
-        else:
-            metabolite = shorten(
-                self._metabolite.id, width=column_width, placeholder="..."
+        key = (names, column_width)
+        if key not in self._header_cache:
+            self._header_cache[key] = shorten(
+                self._metabolite_name if names else self._metabolite_id,
+                width=column_width,
+                placeholder="...",
             )
+        metabolite = self._header_cache[key]
 
         production = self._string_table(
-            self._display_flux(self.producing_flux, names, threshold),
+            self._cached_display_flux("producing", names, threshold),
             float_format,
             column_width,
         )
 
         consumption = self._string_table(
-            self._display_flux(self.consuming_flux, names, threshold),
+            self._cached_display_flux("consuming", names, threshold),
             float_format,
             column_width,
         )
@@ -355,7 +627,7 @@ class MetaboliteSummary(Summary):
         return (
             f"{metabolite}\n"
             f"{'=' * len(metabolite)}\n"
-            f"Formula: {self._metabolite.formula}\n\n"
+            f"Formula: {self._metabolite_formula}\n\n"
             f"Producing Reactions\n"
             f"-------------------\n"
             f"{production}\n\n"
@@ -393,23 +665,23 @@ class MetaboliteSummary(Summary):
         threshold = self._normalize_threshold(threshold)
 
         if names:
-            metabolite = self._metabolite.name
+            metabolite = self._metabolite_name
         else:
-            metabolite = self._metabolite.id
+            metabolite = self._metabolite_id
 
         production = self._html_table(
-            self._display_flux(self.producing_flux, names, threshold),
+            self._cached_display_flux("producing", names, threshold),
             float_format,
         )
 
         consumption = self._html_table(
-            self._display_flux(self.consuming_flux, names, threshold),
+            self._cached_display_flux("consuming", names, threshold),
             float_format,
         )
 
         return (
             f"<h3>{metabolite}</h3>"
-            f"<p>{self._metabolite.formula}</p>"
+            f"<p>{self._metabolite_formula}</p>"
             f"<h4>Producing Reactions</h4>"
             f"{production}"
             f"<h4>Consuming Reactions</h4>"
@@ -1,10 +1,17 @@
 """Unit test the MetaboliteSummary class."""
 
 
+import numpy as np
 import pytest
 
+from cobra import Reaction
 from cobra.flux_analysis import flux_variability_analysis, pfba
-from cobra.summary import MetaboliteSummary
+from cobra.summary import MetaboliteSummary, metabolite_summary
+from cobra.summary.metabolite_summary import (
+    _scale_fva,
+    _scale_fva_loop,
+    _scale_fva_vectorized,
+)
 
 
 def test_metabolite_summary_interface(model, opt_solver):
@@ -116,3 +123,131 @@ def test_metabolite_summary_flux_in_context(model, opt_solver, metabolite_id: st
     assert context_summary.to_frame()["flux"].values == pytest.approx(
         outside_summary.to_frame()["flux"].values, abs=model.tolerance
     )
+
+
+def test_metabolite_summary_isolated_from_model_changes(model, opt_solver):
+    """Test that later changes to the model don't alter an existing summary."""
+    model.solver = opt_solver
+    metabolite = model.metabolites.get_by_id("q8_c")
+    summary = metabolite.summary()
+    expected = summary.to_string()
+    expected_names = summary.to_string(names=True)
+    with model:
+        model.reactions.CYTBD.add_metabolites({model.metabolites.h2o_c: 1})
+        metabolite.name = "changed"
+        assert summary.to_string() == expected
+        assert summary.to_string(names=True) == expected_names
+
+
+def test_metabolite_summary_repeated_rendering(model, opt_solver):
+    """Test that rendering a summary repeatedly always gives the same result."""
+    model.solver = opt_solver
+    summary = model.metabolites.get_by_id("fdp_c").summary(fva=0.99)
+    text = summary.to_string()
+    html = summary.to_html()
+    assert summary.to_string() == text
+    assert summary.to_html() == html
+
+
+def test_metabolite_summary_percent_without_flux(model, opt_solver):
+    """Test that the percentages of a metabolite without flux are zero."""
+    model.solver = opt_solver
+    summary = model.metabolites.get_by_id("glx_c").summary()
+    assert (summary.producing_flux["percent"] == 0).all()
+    assert (summary.consuming_flux["percent"] == 0).all()
+
+
+def test_metabolite_summary_without_flux_distribution(model, opt_solver, monkeypatch):
+    """Test that a summary of only the flux ranges skips the pFBA."""
+    model.solver = opt_solver
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pFBA should not be run.")
+
+    monkeypatch.setattr("cobra.summary.metabolite_summary.pfba", fail)
+    summary = model.metabolites.get_by_id("fdp_c").summary(solution=False, fva=0.99)
+    assert summary.producing_flux["flux"].isna().all()
+    assert summary.producing_flux.at["PFK", "minimum"] == pytest.approx(6.17, abs=1e-2)
+    assert summary.producing_flux.at["PFK", "maximum"] == pytest.approx(9.26, abs=1e-2)
+    assert "PFK" in summary.to_string()
+
+
+def test_metabolite_summary_without_flux_distribution_requires_fva(model, opt_solver):
+    """Test that skipping the flux distribution without FVA is an error."""
+    model.solver = opt_solver
+    with pytest.raises(ValueError):
+        model.metabolites.get_by_id("fdp_c").summary(solution=False)
+
+
+def test_metabolite_summary_scale_fva_implementations():
+    """Test that the element-wise and vectorized FVA scaling agree."""
+    flux = np.array([1e-12, -2.0, 3.0, np.nan, 0.0])
+    minimum = np.array([-1e-12, -4.0, np.nan, 1.0, -5.0])
+    maximum = np.array([1e-12, 2.0, 6.0, 2.0, 5.0])
+    factor = np.array([1.0, -2.0, 0.5, -1.0, 1.0])
+    expected = [flux.copy(), minimum.copy(), maximum.copy()]
+    result = [flux.copy(), minimum.copy(), maximum.copy()]
+    _scale_fva_vectorized(*expected, factor, 1e-9)
+    _scale_fva_loop(*result, factor, 1e-9)
+    for left, right in zip(expected, result):
+        assert left == pytest.approx(right, nan_ok=True)
+    assert expected[1] == pytest.approx([0.0, -4.0, 0.0, -2.0, -5.0])
+    assert expected[2] == pytest.approx([0.0, 8.0, 3.0, -1.0, 5.0])
+
+
+def test_metabolite_summary_lazy_flux_tables(model, opt_solver):
+    """Test that the producing and consuming tables are only built on access."""
+    model.solver = opt_solver
+    summary = model.metabolites.get_by_id("q8_c").summary()
+    assert "producing_flux" not in vars(summary)
+    assert "consuming_flux" not in vars(summary)
+    assert summary.producing_flux is summary.producing_flux
+    assert "consuming_flux" not in vars(summary)
+
+
+def test_metabolite_summary_keeps_no_reactions(model, opt_solver):
+    """Test that a summary holds no references to the model's reactions."""
+    model.solver = opt_solver
+    summary = model.metabolites.get_by_id("q8_c").summary()
+    for value in vars(summary).values():
+        items = value if isinstance(value, (list, tuple)) else [value]
+        assert not any(isinstance(item, Reaction) for item in items)
+
+
+def test_metabolite_summary_rejects_true_solution(model, opt_solver):
+    """Test that ``True`` is not accepted in place of a solution."""
+    model.solver = opt_solver
+    with pytest.raises(ValueError):
+        model.metabolites.get_by_id("fdp_c").summary(solution=True, fva=0.99)
+
+
+def test_metabolite_summary_scale_fva_compiled(monkeypatch):
+    """Test that the numba-compiled FVA scaling agrees with the vectorized one."""
+    pytest.importorskip("numba")
+    monkeypatch.setattr(metabolite_summary, "_JIT_MIN_SIZE", 0)
+    assert metabolite_summary._compile_scale_fva() is not None
+    rng = np.random.default_rng(42)
+    flux = rng.normal(size=50)
+    minimum = flux - rng.random(size=50)
+    maximum = flux + rng.random(size=50)
+    flux[:5] = 1e-12
+    minimum[5:10] = np.nan
+    factor = rng.choice([-2.0, -1.0, 0.5, 1.0], size=50)
+    expected = [flux.copy(), minimum.copy(), maximum.copy()]
+    result = [flux.copy(), minimum.copy(), maximum.copy()]
+    _scale_fva_vectorized(*expected, factor, 1e-9)
+    _scale_fva(*result, factor, 1e-9)
+    for left, right in zip(expected, result):
+        assert left == pytest.approx(right, nan_ok=True)
+
+
+@pytest.mark.parametrize("fva", [None, 0.95])
+def test_metabolite_summary_stale_solution(model, opt_solver, fva):
+    """Test that a solution lacking some of the reactions is an error."""
+    model.solver = opt_solver
+    solution = model.optimize()
+    reaction = Reaction("NEW")
+    model.add_reactions([reaction])
+    reaction.add_metabolites({model.metabolites.atp_c: -1})
+    with pytest.raises(KeyError, match="NEW"):
+        model.metabolites.get_by_id("atp_c").summary(solution=solution, fva=fva)